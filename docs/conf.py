@@ -18,10 +18,13 @@
 # relative to the documentation root, use os.path.abspath to make it
 # absolute, like shown here.
 #
+import json
 import os
+import re
 import sys
+import time
 import warnings
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 
 sys.path.insert(0, os.path.abspath(".."))
@@ -31,11 +34,8 @@ if os.environ.get("READTHEDOCS") and "ESMFMKFILE" not in os.environ:
     # See conda-forge/esmf-feedstock#91 and readthedocs/readthedocs.org#4067
     os.environ["ESMFMKFILE"] = str(Path(os.__file__).parent.parent / "esmf.mk")
 
-import xscen  # noqa: E402,F401
-import xarray  # noqa: E402
-
-xarray.DataArray.__module__ = "xarray"
-xarray.Dataset.__module__ = "xarray"
+from importlib.metadata import PackageNotFoundError  # noqa: E402
+from importlib.metadata import version as _pkg_version  # noqa: E402
 
 # -- General configuration ---------------------------------------------
 
@@ -43,20 +43,26 @@ xarray.Dataset.__module__ = "xarray"
 # extensions coming with Sphinx (named 'sphinx.ext.*') or your custom ones.
 extensions = [
     "sphinx.ext.autodoc",
-    "sphinx.ext.autosectionlabel",
     "sphinx.ext.autosummary",
-    "sphinx.ext.coverage",
     "sphinx.ext.extlinks",
     "sphinx.ext.intersphinx",
-    "sphinx.ext.mathjax",
     "sphinx.ext.napoleon",
-    "sphinx.ext.todo",
-    "sphinx.ext.viewcode",
-    "nbsphinx",
+    "myst_nb",
     "sphinx_codeautolink",
     "sphinx_copybutton",
-    "sphinx_mdinclude",
 ]
+# To quickly iterate on the narrative pages, without importing the API.
+try:
+    skip_api = int(os.getenv("SKIP_API"))
+except TypeError:
+    skip_api = False
+if skip_api:
+    warnings.warn("SKIP_API is set. Not documenting the API.")
+    for ext in ["sphinx.ext.autodoc", "sphinx.ext.autosummary", "sphinx_codeautolink"]:
+        extensions.remove(ext)
+# The "[source]" pages are only built on ReadTheDocs (or when FULL_DOCS is set), as they re-import the whole API.
+elif os.getenv("READTHEDOCS") or os.getenv("FULL_DOCS"):
+    extensions.append("sphinx.ext.viewcode")
 
 # To ensure that underlined fields (e.g. `_field`) are shown in the docs.
 autodoc_default_options = {
@@ -64,65 +70,86 @@ autodoc_default_options = {
     "undoc-members": True,
     "private-members": False,
     "special-members": False,
+    "inherited-members": False,
 }
 
-autosectionlabel_prefix_document = True
-autosectionlabel_maxdepth = 2
+# The API pages are written by `sphinx-apidoc` (see the Makefile) and `api.rst`, and no page
+# uses `autosummary` stubs, so there is no need to scan all sources for them on every build.
+autosummary_generate = False
 
-autosummary_generate = True
+# Headings of the notebooks get slug anchors, so that they can be linked to (e.g. `1_catalog.ipynb#basic-catalog-usage`).
+myst_heading_anchors = 4
 
-nbsphinx_execute = "always"
+# Notebooks are executed through jupyter-cache, which only re-runs those whose code cells changed.
+nb_execution_mode = "cache"
+nb_execution_cache_path = str(Path(__file__).parent.joinpath(".jupyter_cache"))
+nb_execution_timeout = 300
 # To avoid running notebooks on linkcheck and when building PDF.
 try:
     skip_notebooks = int(os.getenv("SKIP_NOTEBOOKS"))
 except TypeError:
     skip_notebooks = False
-if skip_notebooks:
+# To force the execution of all notebooks (e.g. for release builds).
+try:
+    force_notebooks = int(os.getenv("FORCE_NB_EXEC"))
+except TypeError:
+    force_notebooks = False
+if force_notebooks:
+    nb_execution_mode = "force"
+elif skip_notebooks:
     warnings.warn("SKIP_NOTEBOOKS is set. Not executing notebooks.")
-    nbsphinx_execute = "never"
+    nb_execution_mode = "off"
 elif (os.getenv("READTHEDOCS_VERSION_NAME") in ["latest", "stable"]) or (
     os.getenv("READTHEDOCS_VERSION_TYPE") in ["tag"]
 ):
     if Path(__file__).parent.joinpath("notebooks/_data").exists():
         warnings.warn("Notebook artefacts found. Not executing notebooks.")
-        nbsphinx_execute = "never"
+        nb_execution_mode = "off"
 
 # if skip_notebooks or os.getenv("READTHEDOCS_VERSION_TYPE") in [
 #     "branch",
 #     "external",
 # ]:
 #     warnings.warn("Not executing notebooks.")
-#     nbsphinx_execute = "never"
-
-# To avoid having to install these and burst memory limit on ReadTheDocs.
-# autodoc_mock_imports = [
-#     "cartopy",
-#     "clisops",
-#     "dask",
-#     "h5py",
-#     "intake",
-#     "intake_esm",
-#     "pandas",
-#     "rechunker"
-#     "xarray",
-#     "xclim",
-#     "xesmf",
-#     "zarr",
-# ]
+#     nb_execution_mode = "off"
+
+# To avoid having to import these and burst memory limit on ReadTheDocs.
+autodoc_mock_imports = [
+    "cartopy",
+    "clisops",
+    "h5py",
+    "intake",
+    "intake_esm",
+    "rechunker",
+    "xesmf",
+    "zarr",
+]
 
 napoleon_numpy_docstring = True
 napoleon_use_rtype = False
 napoleon_use_param = False
 napoleon_use_ivar = True
 
+# Inventories are read from the local copies in `_intersphinx/` when they exist (see `make refresh-intersphinx`),
+# and from the remote ones otherwise.
 intersphinx_mapping = {
-    "xclim": ("https://xclim.readthedocs.io/en/latest/", None),
-    "xarray": ("https://docs.xarray.dev/en/stable/", None),
-    "pandas": ("https://pandas.pydata.org/docs/", None),
-    "intake-esm": ("https://intake-esm.readthedocs.io/en/stable/", None),
-    "clisops": ("https://clisops.readthedocs.io/en/latest/", None),
-    "rechunker": ("https://rechunker.readthedocs.io/en/latest/", None),
-    "xesmf": ("https://pangeo-xesmf.readthedocs.io/en/latest/", None),
+    name: (
+        url,
+        (
+            (f"_intersphinx/{name}.inv", None)
+            if Path(__file__).parent.joinpath("_intersphinx", f"{name}.inv").is_file()
+            else None
+        ),
+    )
+    for name, url in {
+        "xclim": "https://xclim.readthedocs.io/en/latest/",
+        "xarray": "https://docs.xarray.dev/en/stable/",
+        "pandas": "https://pandas.pydata.org/docs/",
+        "intake-esm": "https://intake-esm.readthedocs.io/en/stable/",
+        "clisops": "https://clisops.readthedocs.io/en/latest/",
+        "rechunker": "https://rechunker.readthedocs.io/en/latest/",
+        "xesmf": "https://pangeo-xesmf.readthedocs.io/en/latest/",
+    }.items()
 }
 
 extlinks = {
@@ -136,6 +163,12 @@ linkcheck_ignore = [
     r"https://rmets.onlinelibrary.wiley.com/doi/10.1002/qj.3803",  # Error 403: Forbidden
     r"https://library.wmo.int/idurl/4/56300",  # HTTPconnectionPool error
 ]
+linkcheck_workers = 10
+linkcheck_timeout = 15
+linkcheck_retries = 2
+linkcheck_anchors = False
+# URLs that were found to work are not checked again before this many days.
+linkcheck_cache_days = 7
 
 # Add any paths that contain templates here, relative to this directory.
 # templates_path = ['_templates']
@@ -151,17 +184,34 @@ master_doc = "index"
 
 # General information about the project.
 project = "xscen"
-copyright = f"2022-{datetime.now().year}, Ouranos Inc., Gabriel Rondeau-Genesse, and contributors"
+# The year is fixed (updated when releasing), unless SOURCE_DATE_EPOCH is set, so that the configuration is reproducible.
+copyright_year = (
+    datetime.fromtimestamp(int(os.environ["SOURCE_DATE_EPOCH"]), tz=timezone.utc).year
+    if "SOURCE_DATE_EPOCH" in os.environ
+    else 2024
+)
+copyright = f"2022-{copyright_year}, Ouranos Inc., Gabriel Rondeau-Genesse, and contributors"
 author = "Gabriel Rondeau-Genesse"
 
 # The version info for the project you're documenting, acts as replacement
 # for |version| and |release|, also used in various other places throughout
 # the built documents.
 #
-# The short X.Y version.
-version = xscen.__version__
 # The full version, including alpha/beta/rc tags.
-release = xscen.__version__
+# Read from the package metadata rather than from `xscen.__version__`, to avoid importing xscen.
+try:
+    release = _pkg_version("xscen")
+except PackageNotFoundError:
+    # Building from a source tree where xscen isn't installed.
+    release = re.search(
+        r'__version__ = "(.*)"',
+        Path(__file__).resolve().parents[1].joinpath("src", "xscen", "__init__.py").read_text(),
+    ).group(1)
+# Sphinx rebuilds everything when the release changes, so the build number of development
+# versions ("0.9.2-dev.3", or "0.9.2.dev3" once installed) and any local part are dropped.
+release = re.sub(r"([-.]dev)\.?\d+", r"\1", release.split("+")[0])
+# The short X.Y version.
+version = ".".join(release.split(".")[:2])
 
 # The language for content autogenerated by Sphinx. Refer to documentation
 # for a list of supported languages.
@@ -179,16 +229,19 @@ gettext_compact = False  # optional
 # This patterns also effect to html_static_path and html_extra_path
 exclude_patterns = [
     "_build",
+    ".doctrees-cache",
+    ".jupyter_cache",
+    # Artefacts written by the notebooks. They are not sources and shouldn't be scanned.
+    "notebooks/_data",
     "Thumbs.db",
     ".DS_Store",
 ]
+if skip_api:
+    exclude_patterns.extend(["api.rst", "apidoc"])
 
 # The name of the Pygments (syntax highlighting) style to use.
 pygments_style = "sphinx"
 
-# If true, `todo` and `todoList` produce output, else they produce nothing.
-todo_include_todos = False
-
 
 # -- Options for HTML output -------------------------------------------
 
@@ -276,3 +329,54 @@ texinfo_documents = [
         "Miscellaneous",
     ),
 ]
+
+
+def _retag_xarray(app, config):
+    # Imported here, so that xarray is only loaded when autodoc is about to be used.
+    import xarray
+
+    xarray.DataArray.__module__ = "xarray"
+    xarray.Dataset.__module__ = "xarray"
+
+
+def _linkcheck_cache_file(app):
+    # Next to the doctrees, which survive `make clean`.
+    return Path(app.doctreedir) / "linkcheck_cache.json"
+
+
+def _linkcheck_skip_cached(app):
+    # Working URLs that were checked recently are added to the ignored patterns.
+    if app.builder.name != "linkcheck" or not _linkcheck_cache_file(app).exists():
+        return
+    cache = json.loads(_linkcheck_cache_file(app).read_text())
+    oldest = time.time() - app.config.linkcheck_cache_days * 86400
+    recent = [re.escape(uri) for uri, checked in cache.items() if checked >= oldest]
+    if recent:
+        # As a single alternation, as Sphinx tries every pattern of `linkcheck_ignore` on every URL.
+        app.config.linkcheck_ignore.append(f"(?:{'|'.join(recent)})$")
+
+
+def _linkcheck_update_cache(app, exception):
+    output = Path(app.outdir) / "output.json"
+    if app.builder.name != "linkcheck" or exception is not None or not output.exists():
+        return
+    cache = {}
+    if _linkcheck_cache_file(app).exists():
+        cache = json.loads(_linkcheck_cache_file(app).read_text())
+    now = time.time()
+    for line in output.read_text().splitlines():
+        result = json.loads(line)
+        if result["status"] == "working":
+            cache[result["uri"]] = now
+        elif result["status"] != "ignored":
+            cache.pop(result["uri"], None)
+    _linkcheck_cache_file(app).write_text(json.dumps(cache, indent=2))
+
+
+def setup(app):
+    """Connect the xarray re-tagging and the linkcheck cache."""
+    app.add_config_value("linkcheck_cache_days", 7, "")
+    if not skip_api:
+        app.connect("config-inited", _retag_xarray)
+    app.connect("builder-inited", _linkcheck_skip_cached)
+    app.connect("build-finished", _linkcheck_update_cache)
@@ -7,8 +7,12 @@ REM Command file for Sphinx documentation
 if "%SPHINXBUILD%" == "" (
 	set SPHINXBUILD=python -msphinx
 )
+if "%SPHINXOPTS%" == "" (
+	set SPHINXOPTS=-j auto -T
+)
 set SOURCEDIR=.
 set BUILDDIR=_build
+set DOCTREEDIR=.doctrees-cache
 set SPHINXPROJ=xscen
 
 if "%1" == "" goto help
@@ -26,7 +30,7 @@ if errorlevel 9009 (
 	exit /b 1
 )
 
-%SPHINXBUILD% -M %1 %SOURCEDIR% %BUILDDIR% %SPHINXOPTS%
+%SPHINXBUILD% -M %1 %SOURCEDIR% %BUILDDIR% -d %DOCTREEDIR%\%1 %SPHINXOPTS%
 goto end
 
 :help
@@ -1,6 +1,8 @@
 """Functions to aggregate data over time and space."""
 
 import datetime
+import functools
+import hashlib
 import logging
 import os
 import warnings
@@ -47,6 +49,59 @@ def _(s):
     return s
 
 
+def _unstack_time(ds: xr.Dataset, fields: Sequence[str]) -> xr.Dataset:
+    """Unstack the 'time' dimension into the given datetime fields (e.g. 'year', 'month' and 'day').
+
+    When the time steps form a complete and ordered product of the fields, as is the case for regular
+    monthly, seasonal or yearly data, the numpy-backed variables are simply reshaped.
+    Otherwise, this falls back to :py:meth:`xarray.Dataset.unstack`.
+    """
+    # Read the fields from the index itself, not through the DataArray 'dt' accessor
+    times = ds.indexes["time"]
+    mindex = pd.MultiIndex.from_arrays(
+        [np.asarray(getattr(times, f)) for f in fields], names=list(fields)
+    )
+    shape = tuple(len(level) for level in mindex.levels)
+    if (
+        np.prod(shape) == len(mindex)
+        and mindex.is_unique
+        and mindex.is_monotonic_increasing
+        and not any(
+            xc.core.utils.uses_dask(v)
+            for v in ds.variables.values()
+            if "time" in v.dims
+        )
+    ):
+        variables = {}
+        for name, var in ds.variables.items():
+            if name == "time":
+                continue
+            if "time" in var.dims:
+                var = var.transpose("time", ...)
+                var = xr.Variable(
+                    tuple(fields) + var.dims[1:],
+                    var.values.reshape(shape + var.shape[1:]),
+                    attrs=var.attrs,
+                    encoding=var.encoding,
+                )
+            variables[name] = var
+        return xr.Dataset(
+            {v: variables[v] for v in ds.data_vars},
+            coords={c: variables[c] for c in ds.coords if c != "time"}
+            | {f: level.values for f, level in zip(fields, mindex.levels)},
+            attrs=ds.attrs,
+        )
+
+    try:
+        mindex_coords = xr.Coordinates.from_pandas_multiindex(mindex, dim="time")
+        return ds.assign_coords(coords=mindex_coords).unstack("time")
+    except (
+        AttributeError,
+        ValueError,
+    ):  # Fixme when xscen is pinned to xarray >= 2023.11.0
+        return ds.assign(time=mindex).unstack("time")
+
+
 @parse_config
 def climatological_mean(
     ds: xr.Dataset,
@@ -184,31 +239,10 @@ def climatological_op(  # noqa: C901
         )
 
     # unstack 1D time in coords (day, month, and year) to make climatological mean faster
-    try:
-        mindex_coords = xr.Coordinates.from_pandas_multiindex(
-            pd.MultiIndex.from_arrays(
-                [
-                    ds.time.dt.year.values,
-                    ds.time.dt.month.values,
-                    ds.time.dt.day.values,
-                ],
-                names=["year", "month", "day"],
-            ),
-            dim="time",
-        )
-        ds_unstack = ds.assign_coords(coords=mindex_coords).unstack("time")
-    except (
-        AttributeError,
-        ValueError,
-    ):  # Fixme when xscen is pinned to xarray >= 2023.11.0
-        ind = pd.MultiIndex.from_arrays(
-            [ds.time.dt.year.values, ds.time.dt.month.values, ds.time.dt.day.values],
-            names=["year", "month", "day"],
-        )
-        ds_unstack = ds.assign(time=ind).unstack("time")
+    ds_unstack = _unstack_time(ds, ["year", "month", "day"])
 
     # Rolling will ignore gaps in time, so raise an exception beforehand
-    if (not all(ds_unstack.year.diff(dim="year", n=1) == 1)) & (periods is None):
+    if (periods is None) and not np.all(np.diff(ds_unstack.year.values) == 1):
         raise ValueError("Data is not continuous. Use the 'periods' argument.")
 
     # define periods, windows, and min_periods
@@ -388,7 +422,7 @@ def climatological_op(  # noqa: C901
                     "month": ds_rolling.month.values,
                     "day": ds_rolling.day.values,
                 }
-            ).to_list()
+            ).values
         elif isinstance(ds.indexes["time"], xr.coding.cftimeindex.CFTimeIndex):
             time_coord = [
                 xclim.core.calendar.datetime_classes[ds.time.dt.calendar](
@@ -410,7 +444,10 @@ def climatological_op(  # noqa: C901
         # end loop over periods
 
     # concatenate results
-    ds_rolling = xr.concat(concats, dim="time", data_vars="minimal")
+    # All periods come from the same dataset, so the coordinates without 'time' need not be compared
+    ds_rolling = xr.concat(
+        concats, dim="time", data_vars="minimal", coords="minimal", compat="override"
+    )
 
     # update data_vars names, attrs, history
     if rename_variables:
@@ -418,35 +455,35 @@ def climatological_op(  # noqa: C901
             {vv: f"{vv}_clim_{op}" for vv in ds_rolling.data_vars}
         )
 
+    # The operation's name and the history entry are the same for all variables
+    try:
+        op_format = dict.fromkeys(("mean", "std", "var", "sum"), "adj") | dict.fromkeys(
+            ("max", "min"), "noun"
+        )
+        operation = xc.core.formatting.default_formatter.format_field(op, op_format[op])
+    except (KeyError, ValueError):
+        operation = op
+    new_history = (
+        f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {window}-year climatological {operation} "
+        f"over window (non-centered), with a minimum of {min_periods} years of data - xarray v{xr.__version__}"
+    )
+
     for vv in ds_rolling.data_vars:
+        da = ds_rolling[vv]
         for a in ["description", "long_name"]:
-            try:
-                op_format = dict.fromkeys(
-                    ("mean", "std", "var", "sum"), "adj"
-                ) | dict.fromkeys(("max", "min"), "noun")
-                operation = xc.core.formatting.default_formatter.format_field(
-                    op, op_format[op]
-                )
-            except (KeyError, ValueError):
-                operation = op
             update_attr(
-                ds_rolling[vv],
+                da,
                 a,
                 _("{window}-year climatological {operation} of {attr}."),
                 window=window,
                 operation=operation,
             )
 
-        new_history = (
-            f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {window}-year climatological {operation} "
-            f"over window (non-centered), with a minimum of {min_periods} years of data - xarray v{xr.__version__}"
-        )
-        history = (
-            new_history + " \n " + ds_rolling[vv].attrs["history"]
-            if "history" in ds_rolling[vv].attrs
+        da.attrs["history"] = (
+            new_history + " \n " + da.attrs["history"]
+            if "history" in da.attrs
             else new_history
         )
-        ds_rolling[vv].attrs["history"] = history
 
     # update processing level
     if to_level is not None:
@@ -543,7 +580,13 @@ def compute_deltas(  # noqa: C901
         # Separate the reference from the other horizons
         if xc.core.utils.uses_dask(ds["horizon"]):
             ds["horizon"].load()
-        ref = ds.where(ds.horizon == reference_horizon, drop=True)
+        if ds["horizon"].ndim == 1:
+            # Index the reference directly rather than masking every horizon
+            ref = ds.isel(
+                {ds["horizon"].dims[0]: ds["horizon"].values == reference_horizon}
+            )
+        else:
+            ref = ds.where(ds.horizon == reference_horizon, drop=True)
     elif isinstance(reference_horizon, xr.Dataset):
         ref = reference_horizon
         if "horizon" in ref:
@@ -567,52 +610,14 @@ def compute_deltas(  # noqa: C901
             )
 
         # Remove references to 'year' in REF
-        try:
-            mindex_coords_1 = xr.Coordinates.from_pandas_multiindex(
-                pd.MultiIndex.from_arrays(
-                    [ref.time.dt.month.values, ref.time.dt.day.values],
-                    names=["month", "day"],
-                ),
-                dim="time",
-            )
-            ref = ref.assign_coords(coords=mindex_coords_1).unstack("time")
-
-            mindex_coords_2 = xr.Coordinates.from_pandas_multiindex(
-                pd.MultiIndex.from_arrays(
-                    [
-                        ds.time.dt.year.values,
-                        ds.time.dt.month.values,
-                        ds.time.dt.day.values,
-                    ],
-                    names=["year", "month", "day"],
-                ),
-                dim="time",
-            )
-            other_hz = ds.assign_coords(coords=mindex_coords_2).unstack("time")
-        except (
-            AttributeError,
-            ValueError,
-        ):  # Fixme when xscen is pinned to xarray >= 2023.11.0
-            ind = pd.MultiIndex.from_arrays(
-                [ref.time.dt.month.values, ref.time.dt.day.values],
-                names=["month", "day"],
-            )
-            ref = ref.assign(time=ind).unstack("time")
-
-            ind = pd.MultiIndex.from_arrays(
-                [
-                    ds.time.dt.year.values,
-                    ds.time.dt.month.values,
-                    ds.time.dt.day.values,
-                ],
-                names=["year", "month", "day"],
-            )
-            other_hz = ds.assign(time=ind).unstack("time")
+        ref = _unstack_time(ref, ["month", "day"])
+        other_hz = _unstack_time(ds, ["year", "month", "day"])
 
     else:
         other_hz = ds
         ref = ref.squeeze()
     deltas = xr.Dataset(coords=other_hz.coords, attrs=other_hz.attrs)
+    now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     # Calculate deltas
     for vv in list(ds.data_vars):
         v_name = (
@@ -652,7 +657,9 @@ def compute_deltas(  # noqa: C901
                 kind=_kind,
             )
 
-        new_history = f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {_kind} delta vs. {reference_horizon} - xarray v{xr.__version__}"
+        new_history = (
+            f"[{now}] {_kind} delta vs. {reference_horizon} - xarray v{xr.__version__}"
+        )
         history = (
             new_history + " \n " + deltas[v_name].attrs["history"]
             if "history" in deltas[v_name].attrs
@@ -665,15 +672,13 @@ def compute_deltas(  # noqa: C901
         deltas = deltas.stack(time=("year", "month", "day"))
         # rebuild time coord
         if isinstance(ds.indexes["time"], pd.core.indexes.datetimes.DatetimeIndex):
-            time_coord = list(
-                pd.to_datetime(
-                    {
-                        "year": deltas.year.values,
-                        "month": deltas.month.values,
-                        "day": deltas.day.values,
-                    }
-                ).values
-            )
+            time_coord = pd.to_datetime(
+                {
+                    "year": deltas.year.values,
+                    "month": deltas.month.values,
+                    "day": deltas.day.values,
+                }
+            ).values
         elif isinstance(ds.indexes["time"], xr.coding.cftimeindex.CFTimeIndex):
             time_coord = [
                 xclim.core.calendar.datetime_classes[ds.time.dt.calendar](y, m, d)
@@ -689,7 +694,10 @@ def compute_deltas(  # noqa: C901
             .assign(time=time_coord)
             .transpose("time", ...)
         )
-        deltas = deltas.reindex_like(ds)
+        # A complete year/month/day grid stacks back in the original order,
+        # only the padding of incomplete ones needs to be removed.
+        if not deltas.indexes["time"].equals(ds.indexes["time"]):
+            deltas = deltas.reindex_like(ds)
 
     if to_level is not None:
         deltas.attrs["cat:processing_level"] = to_level
@@ -697,6 +705,61 @@ def compute_deltas(  # noqa: C901
     return deltas
 
 
+@functools.lru_cache(maxsize=8)
+def _read_shapefile(path: str, mtime: int) -> gpd.GeoDataFrame:
+    # The modification time is only part of the cache key, so that edited files are read again.
+    return gpd.read_file(path)
+
+
+def _read_shape(shape: Union[str, os.PathLike]) -> gpd.GeoDataFrame:
+    """Read a shapefile, reusing the result of previous reads of the same unchanged file.
+
+    A copy is returned, so that callers can modify it without altering the cache.
+    Paths that are not local files (e.g. URLs) are always read again.
+    """
+    path = Path(shape)
+    if not path.is_file():
+        return gpd.read_file(shape)
+    return _read_shapefile(str(path.resolve()), path.stat().st_mtime_ns).copy()
+
+
+# SpatialAverager instances built by spatial_mean, from the oldest to the most recently used.
+_SPATIAL_AVERAGERS = {}
+_SPATIAL_AVERAGERS_MAXSIZE = 8
+
+
+def _get_spatial_averager(ds: xr.Dataset, geoms, **kwargs):
+    """Return a xesmf.SpatialAverager for the grid of ds and the given geometries.
+
+    Computing the weights is the expensive part of the averaging. Since they only depend on the grid,
+    the polygons and the arguments, the averagers are kept in memory and reused across calls.
+    """
+    grid = [ds.cf["longitude"], ds.cf["latitude"]]
+    grid.extend(
+        ds.cf.get_bounds(c) for c in ["longitude", "latitude"] if c in ds.cf.bounds
+    )
+    if "mask" in ds:
+        grid.append(ds["mask"])
+
+    key = hashlib.sha1()
+    for da in grid:
+        key.update(repr((da.name, da.dims, da.shape)).encode())
+        key.update(np.ascontiguousarray(da.values).tobytes())
+    for geom in shapely.to_wkb(geoms):
+        key.update(geom)
+    key.update(repr(sorted(kwargs.items())).encode())
+    key = key.hexdigest()
+
+    if key in _SPATIAL_AVERAGERS:
+        # Mark as the most recently used
+        _SPATIAL_AVERAGERS[key] = _SPATIAL_AVERAGERS.pop(key)
+    else:
+        _SPATIAL_AVERAGERS[key] = xe.SpatialAverager(ds, geoms, **kwargs)
+        if len(_SPATIAL_AVERAGERS) > _SPATIAL_AVERAGERS_MAXSIZE:
+            _SPATIAL_AVERAGERS.pop(next(iter(_SPATIAL_AVERAGERS)))
+    return _SPATIAL_AVERAGERS[key]
+
+
 @parse_config
 def spatial_mean(  # noqa: C901
     ds: xr.Dataset,
@@ -807,7 +870,8 @@ def spatial_mean(  # noqa: C901
             "You seem to be using a deprecated version of region. Please use the new formatting.",
             category=FutureWarning,
         )
-        region = deepcopy(region)
+        # Only top-level keys are changed, a shallow copy leaves the user's region untouched
+        region = dict(region)
         if "buffer" in region:
             region["tile_buffer"] = region.pop("buffer")
         _kwargs = region.pop(region["method"])
@@ -896,7 +960,7 @@ def spatial_mean(  # noqa: C901
                 kwargs[ds.cf.axes["Y"][0]] = ds[ds.cf.axes["Y"][0]].mean().values
         else:
             if region["method"] == "gridpoint":
-                if len(region["lon"] != 1):
+                if np.size(region["lon"]) != 1:
                     raise ValueError(
                         "Only a single location should be used with interp_centroid."
                     )
@@ -913,14 +977,15 @@ def spatial_mean(  # noqa: C901
 
             elif region["method"] == "shape":
                 if not isinstance(region["shape"], gpd.GeoDataFrame):
-                    s = gpd.read_file(region["shape"])
+                    s = _read_shape(region["shape"])
                 else:
                     s = region["shape"]
-                if len(s != 1):
+                if len(s) != 1:
                     raise ValueError(
                         "Only a single polygon should be used with interp_centroid."
                     )
-                centroid = {"lon": s.centroid[0].x, "lat": s.centroid[0].y}
+                point = s.geometry.centroid.iloc[0]
+                centroid = {"lon": point.x, "lat": point.y}
             else:
                 raise ValueError("'method' not understood.")
             kwargs.update(centroid)
@@ -958,7 +1023,7 @@ def spatial_mean(  # noqa: C901
         # If the region is a shapefile, open with geopandas
         elif region["method"] == "shape":
             if not isinstance(region["shape"], gpd.GeoDataFrame):
-                polygon = gpd.read_file(region["shape"])
+                polygon = _read_shape(region["shape"])
                 name = Path(region["shape"]).name
             else:
                 polygon = region["shape"]
@@ -980,7 +1045,7 @@ def spatial_mean(  # noqa: C901
         else:
             raise ValueError("'method' should be one of [bbox, shape].")
 
-        kwargs_copy = deepcopy(kwargs)
+        kwargs_copy = dict(kwargs)
         call_kwargs = {"skipna": kwargs_copy.pop("skipna", False)}
         if "output_chunks" in kwargs:
             call_kwargs["output_chunks"] = kwargs_copy.pop("output_chunks")
@@ -997,7 +1062,7 @@ def spatial_mean(  # noqa: C901
 
             ds = ds.update(create_bounds_rotated_pole(ds))
 
-        savg = xe.SpatialAverager(ds, geoms, **kwargs_copy)
+        savg = _get_spatial_averager(ds, geoms, **kwargs_copy)
         ds_agg = savg(ds, keep_attrs=True, **call_kwargs)
         extra_coords = {
             col: xr.DataArray(polygon[col], dims=("geom",))
@@ -5,13 +5,14 @@ import logging
 import operator as op
 import os
 import queue
+import re
 import string
 import threading
 import warnings
 from collections.abc import Mapping, Sequence
-from copy import deepcopy
-from fnmatch import fnmatch
-from functools import partial, reduce
+from contextlib import nullcontext
+from fnmatch import translate
+from functools import lru_cache, partial, reduce
 from multiprocessing import Pool
 from pathlib import Path
 from typing import Any, Optional, Union
@@ -46,6 +47,32 @@ Add your own types with the :py:func:`register_parse_type` decorator.
 """
 
 
+@lru_cache(maxsize=1024)
+def _compile_pattern(pattern: str) -> parse.Parser:
+    r"""Compile a parse pattern (if needed) for quicker evaluation.
+
+    The `no_` default format spec is added where no format spec was given.
+    The field prefix "?" is converted to "_" so the field name is a valid python variable name.
+    Compiled patterns are cached, the cache is cleared when a new parse type is registered.
+    """
+    if isinstance(pattern, parse.Parser):
+        return pattern
+
+    parts = []
+    for pre, field, fmt, _ in string.Formatter().parse(pattern):
+        if not fmt:
+            fmt = "no_"
+        if field:
+            if field.startswith("?"):
+                field = "_" + field[1:]
+            if field == "DATES":
+                fmt = "datebounds"
+            parts.extend([pre, "{", field, ":", fmt, "}"])
+        else:
+            parts.append(pre)
+    return parse.compile("".join(parts), EXTRA_PARSE_TYPES)
+
+
 def register_parse_type(name: str, regex: str = r"([^\_\/\\]*)", group_count: int = 1):
     r"""Register a new parse type to be available in :py:func:`parse_directory` patterns.
 
@@ -68,6 +95,8 @@ def register_parse_type(name: str, regex: str = r"([^\_\/\\]*)", group_count: in
         EXTRA_PARSE_TYPES[name] = parse.with_pattern(
             regex, regex_group_count=group_count
         )(func)
+        # Patterns compiled before the registration might have a different meaning now.
+        _compile_pattern.cache_clear()
         return func
 
     return _register_parse_type
@@ -121,54 +150,57 @@ def _find_assets(
         This pattern can not include the asset's basename.
     """
     root = str(Path(root))  # to be sure
-    for top, alldirs, files in os.walk(root):
-        # Split zarr subdirectories from next iteration
-        zarrs = []
-        for dr in deepcopy(alldirs):
-            if dr.endswith(".zarr"):
-                zarrs.append(dr)
-                alldirs.remove(dr)
-
-        if (
-            top != root
-            and (os.path.relpath(top, root).count(os.path.sep) + 1) not in lengths
-        ):
-            continue
+    max_depth = max(lengths, default=0)
+    file_exts = exts - {".zarr"}
+    # Same as fnmatch.fnmatch, but the pattern is only translated once.
+    dirmatch = (
+        re.compile(translate(os.path.normcase(dirglob))).match
+        if dirglob is not None
+        else None
+    )
 
-        if dirglob is not None and not fnmatch(top, dirglob):
-            continue
+    def _walk(top, depth):
+        # Same behaviour as os.walk : unreadable folders are skipped and symlinks to folders are not followed.
+        try:
+            with os.scandir(top) as it:
+                entries = list(it)
+        except OSError:
+            return
+
+        # Assets directly under the root are always considered, deeper ones only if their depth is requested.
+        if (depth == 0 or depth in lengths) and (
+            dirmatch is None or dirmatch(os.path.normcase(top))
+        ):
+            for entry in entries:
+                if entry.is_dir():
+                    # Zarr datasets are folders, but they are assets and are not walked through.
+                    if ".zarr" in exts and entry.name.endswith(".zarr"):
+                        yield entry.path
+                elif os.path.splitext(entry.name)[-1] in file_exts:
+                    yield entry.path
+
+        if depth < max_depth:
+            for entry in entries:
+                if (
+                    not entry.name.endswith(".zarr")
+                    and entry.is_dir()
+                    and not entry.is_symlink()
+                ):
+                    yield from _walk(entry.path, depth + 1)
 
-        if ".zarr" in exts:
-            for zr in zarrs:
-                yield os.path.join(top, zr)
-        if exts - {".zarr"}:  # There are more exts than
-            for file in files:
-                if os.path.splitext(file)[-1] in exts:
-                    yield os.path.join(top, file)
+    yield from _walk(root, 0)
 
 
-def _compile_pattern(pattern: str) -> parse.Parser:
-    r"""Compile a parse pattern (if needed) for quicker evaluation.
+def _relative_path(path: Union[os.PathLike, str], root: Union[os.PathLike, str]) -> str:
+    """Return the path relative to the root, as a string.
 
-    The `no_` default format spec is added where no format spec was given.
-    The field prefix "?" is converted to "_" so the field name is a valid python variable name.
+    Paths found by :py:func:`_find_assets` start with the root, they are simply sliced, which is much faster than pathlib.
     """
-    if isinstance(pattern, parse.Parser):
-        return pattern
-
-    parts = []
-    for pre, field, fmt, _ in string.Formatter().parse(pattern):
-        if not fmt:
-            fmt = "no_"
-        if field:
-            if field.startswith("?"):
-                field = "_" + field[1:]
-            if field == "DATES":
-                fmt = "datebounds"
-            parts.extend([pre, "{", field, ":", fmt, "}"])
-        else:
-            parts.append(pre)
-    return parse.compile("".join(parts), EXTRA_PARSE_TYPES)
+    path = os.fspath(path)
+    prefix = os.fspath(root).rstrip(os.sep) + os.sep
+    if path.startswith(prefix):
+        return path[len(prefix) :]
+    return str(Path(path).relative_to(Path(root)))
 
 
 def _name_parser(
@@ -209,21 +241,21 @@ def _name_parser(
     parse_directory
     parse_from_ds
     """
-    abs_path = Path(path)
-    path = abs_path.relative_to(Path(root))
+    rel_path = _relative_path(path, root)
     xr_open_kwargs = xr_open_kwargs or {}
 
     d = {}
     for pattern in map(_compile_pattern, patterns):
-        res = pattern.parse(str(path))
+        res = pattern.parse(rel_path)
         if res:
             d = res.named
             break
     else:
         return None
 
+    abs_path = Path(path)
     d["path"] = abs_path
-    d["format"] = path.suffix[1:]
+    d["format"] = os.path.splitext(rel_path)[-1][1:]
 
     if "DATES" in d:
         d["date_start"], d["date_end"] = d.pop("DATES")
@@ -256,6 +288,7 @@ def _parse_dir(  # noqa: C901
     attrs_map: Optional[dict] = None,
     xr_open_kwargs: Optional[dict] = None,
     progress: bool = False,
+    processes: int = 1,
 ):
     """Iterate and parses files in a directory, filtering according to basic pattern properties and optional checks.
 
@@ -285,15 +318,28 @@ def _parse_dir(  # noqa: C901
         If `read_from_file` is not None, passed directly to :py:func:`parse_from_ds`.
     progress: bool
         If True, the number of found files is printed to stdout.
+    processes: int
+        If larger than 1, the files are parsed in a pool of this many processes.
+        This is mostly useful when `read_from_file` is given, since each file is then opened.
 
     Return
     ------
     List of dictionaries
         Metadata parsed from each found asset.
     """
-    lengths = {patt.count(os.path.sep) for patt in patterns}
-    exts = {os.path.splitext(patt)[-1] for patt in patterns}
-    comp_patterns = list(map(_compile_pattern, patterns))
+    root = str(
+        Path(root)
+    )  # Same as in _find_assets, so paths can be made relative quickly.
+    # Patterns are indexed by extension and depth, so each path is only checked against those that could match it.
+    patterns_index = {}
+    for patt in patterns:
+        key = (os.path.splitext(patt)[-1], patt.count(os.path.sep))
+        patterns_index.setdefault(key, []).append(patt)
+    comp_patterns = {
+        key: list(map(_compile_pattern, patts)) for key, patts in patterns_index.items()
+    }
+    exts = {ext for ext, _ in comp_patterns}
+    lengths = {depth for _, depth in comp_patterns}
     checks = checks or []
 
     # Multithread, communicating via FIFO queues.
@@ -304,9 +350,16 @@ def _parse_dir(  # noqa: C901
     # Thus we parallelize the parsing steps.
     # If the name-parsing step becomes blocking, we could try to increase the number of threads (but netCDF4 can't multithread...)
     # Usually, the walking is the bottleneck.
+    # When opening the files, the parsing can be sent to a pool of processes instead.
     q_found = queue.Queue()
     q_checked = queue.Queue()
     parsed = []
+    results = []
+    parse_kwargs = dict(
+        read_from_file=read_from_file,
+        attrs_map=attrs_map,
+        xr_open_kwargs=xr_open_kwargs,
+    )
 
     def check_worker():
         # Worker that processes the checks.
@@ -330,47 +383,65 @@ def _parse_dir(  # noqa: C901
                 q_checked.put(path)
             q_found.task_done()
 
+    def add_parsed(path, d):
+        if d is not None:
+            parsed.append(d)
+            n = len(parsed)
+            # Print number of files but on round numbers to limit the calls to stdout for large collections
+            if progress and all([(n < N or (n % N == 0)) for N in [10, 100, 1000]]):
+                print(f"Found {n:7d} files", end="\r")
+        else:
+            logger.debug(f"File {path} didn't match any pattern.")
+
     def parse_worker():
         # Worker that parses the paths
         while True:
             path = q_checked.get()
-            try:
-                d = _name_parser(
-                    path,
-                    root,
-                    comp_patterns,
-                    read_from_file=read_from_file,
-                    attrs_map=attrs_map,
-                    xr_open_kwargs=xr_open_kwargs,
+            key = (
+                os.path.splitext(path)[-1],
+                _relative_path(path, root).count(os.path.sep),
+            )
+            if pool is not None:
+                # Patterns are sent as strings, they are compiled (and cached) in the workers.
+                res = pool.apply_async(
+                    _name_parser,
+                    (path, root, patterns_index.get(key, [])),
+                    parse_kwargs,
                 )
-            except Exception as err:
-                logger.error(f"Parsing file {path} failed with {err}.")
+                results.append((path, res))
             else:
-                if d is not None:
-                    parsed.append(d)
-                    n = len(parsed)
-                    # Print number of files but on round numbers to limit the calls to stdout for large collections
-                    if progress and all(
-                        [(n < N or (n % N == 0)) for N in [10, 100, 1000]]
-                    ):
-                        print(f"Found {n:7d} files", end="\r")
+                try:
+                    d = _name_parser(
+                        path, root, comp_patterns.get(key, []), **parse_kwargs
+                    )
+                except Exception as err:
+                    logger.error(f"Parsing file {path} failed with {err}.")
                 else:
-                    logger.debug(f"File {path} didn't match any pattern.")
+                    add_parsed(path, d)
             q_checked.task_done()
 
-    CW = threading.Thread(target=check_worker, daemon=True)
-    CW.start()
+    with Pool(processes=processes) if processes > 1 else nullcontext() as pool:
+        CW = threading.Thread(target=check_worker, daemon=True)
+        CW.start()
 
-    PW = threading.Thread(target=parse_worker, daemon=True)
-    PW.start()
+        PW = threading.Thread(target=parse_worker, daemon=True)
+        PW.start()
 
-    # Skip the checks if none are requested (save some overhead)
-    q = q_found if checks else q_checked
-    for path in _find_assets(Path(root), exts, lengths, dirglob):
-        q.put(path)
+        # Skip the checks if none are requested (save some overhead)
+        q = q_found if checks else q_checked
+        for path in _find_assets(Path(root), exts, lengths, dirglob):
+            q.put(path)
 
-    q_found.join()
-    q_checked.join()
+        q_found.join()
+        q_checked.join()
+
+        for path, res in results:
+            try:
+                d = res.get()
+            except Exception as err:
+                logger.error(f"Parsing file {path} failed with {err}.")
+            else:
+                add_parsed(path, d)
     return parsed
 
 
@@ -383,33 +454,64 @@ def _get_new_item(name, newval, repval, oldval, fromcol, is_list):
     return newval  # Simple replacement
 
 
-def _replace_in_row(oldrow: pd.Series, replacements: dict):
-    """Replace values in Series (row) according to replacements mapping.
+def _replace_in_df(df: pd.DataFrame, replacements: dict) -> pd.DataFrame:
+    """Replace values in DataFrame according to replacements mapping.
 
     Replacements can be simple mappings, but also mapping to other fields.
-    List-like fields are handled.
+    List-like fields are handled. Replacements are applied in order, each one on all matching rows at once.
     """
-    row = oldrow.copy()
-    list_cols = [col for col in oldrow.index if isinstance(oldrow[col], (tuple, list))]
+    df = df.copy()
+    list_cols = {}
+
+    def is_list(col):
+        # Whether each element of the column is list-like, as it was before any replacement.
+        if col not in list_cols:
+            list_cols[col] = df[col].map(lambda v: isinstance(v, (tuple, list)))
+        return list_cols[col]
+
     for col, reps in replacements.items():
-        if col not in row:
+        if col not in df.columns:
             continue
         for repval, new in reps.items():
             # Either the field is a list containing the value to replace, or it is the value to replace.
-            if (col in list_cols and repval in row[col]) or repval == row[col]:
-                if isinstance(new, dict):  # Replacement is for multiple columns
-                    for name, newval in new.items():
-                        row[name] = _get_new_item(
-                            name, newval, repval, row[col], col, name in list_cols
-                        )
-                else:
-                    row[col] = _get_new_item(
-                        col, new, repval, row[col], col, col in list_cols
+            match = df[col].eq(repval)
+            lists = is_list(col)
+            if lists.any():
+                match[lists] = df.loc[lists, col].map(lambda v: repval in v)
+            if not match.any():
+                continue
+
+            targets = new.items() if isinstance(new, dict) else [(col, new)]
+            for name, newval in targets:
+                if name not in df.columns:
+                    df[name] = None
+                elif df[name].dtype != object:
+                    df[name] = df[name].astype(object)
+                newvals = [
+                    _get_new_item(name, newval, repval, oldval, col, name_is_list)
+                    for oldval, name_is_list in zip(
+                        df.loc[match, col], is_list(name)[match]
                     )
+                ]
+                df.loc[match, name] = pd.Series(
+                    newvals, index=df.index[match], dtype=object
+                )
+
     # Special case for "variable" where we remove Nones.
-    if "variable" in row and "variable" in list_cols and None in row["variable"]:
-        row["variable"] = tuple(v for v in row["variable"] if v is not None)
-    return row
+    if "variable" in df.columns:
+        lists = is_list("variable")
+        has_none = lists.copy()
+        has_none[lists] = df.loc[lists, "variable"].map(lambda v: None in v)
+        if has_none.any():
+            df.loc[has_none, "variable"] = pd.Series(
+                [
+                    tuple(v for v in variables if v is not None)
+                    for variables in df.loc[has_none, "variable"]
+                ],
+                index=df.index[has_none],
+                dtype=object,
+            )
+    return df
 
 
 def _parse_first_ds(
@@ -421,11 +523,28 @@ def _parse_first_ds(
     logger.info(f"Got {len(fromfile)} fields, applying to {len(grp)} entries.")
     out = grp.copy()
     for col, val in fromfile.items():
-        for i in grp.index:  # If val is an iterable we can't use loc.
-            out.at[i, col] = val
+        # Build the column explicitly, otherwise an iterable val would be broadcast element-wise.
+        out[col] = pd.Series([val] * len(out), index=out.index, dtype=object)
     return out
 
 
+def _parse_dates(dates: pd.Series, end_of_period: bool = False) -> pd.Series:
+    """Apply :py:func:`date_parser` to a column, parsing each distinct string only once.
+
+    Other objects (cftime or pandas datetimes, NaNs) are parsed one by one, as mixed calendars can't be compared.
+    """
+    parsed = {}
+
+    def _parse(date):
+        if not isinstance(date, str):
+            return date_parser(date, end_of_period=end_of_period)
+        if date not in parsed:
+            parsed[date] = date_parser(date, end_of_period=end_of_period)
+        return parsed[date]
+
+    return dates.map(_parse)
+
+
 @parse_config
 def parse_directory(  # noqa: C901
     directories: list[Union[str, os.PathLike]],
@@ -445,6 +564,7 @@ def parse_directory(  # noqa: C901
     only_official_columns: bool = True,
     progress: bool = False,
     parallel_dirs: Union[bool, int] = False,
+    parallel_files: Union[bool, int] = False,
     file_checks: Optional[list[str]] = None,
 ) -> pd.DataFrame:
     r"""Parse files in a directory and return them as a pd.DataFrame.
@@ -494,6 +614,10 @@ def parse_directory(  # noqa: C901
     parallel_dirs: bool or int
         If True, each directory is searched in parallel. If an int, it is the number of parallel searches.
         This should only be significantly useful if the directories are on different disks.
+    parallel_files: bool or int
+        If True, files are parsed in parallel, with one process per CPU. If an int, it is the number of processes.
+        This should only be significantly useful if files are opened, see `read_from_file`.
+        Can't be used together with `parallel_dirs`.
     file_checks: list of str, optional
         A list of file checks to run on the parsed files. Available values are:
         - "readable" : Check that the file is readable by the current user.
@@ -579,6 +703,10 @@ def parse_directory(  # noqa: C901
 
     if parallel_dirs is True:
         parallel_dirs = len(directories)
+    if parallel_files is True:
+        parallel_files = os.cpu_count()
+    if parallel_dirs > 1 and parallel_files > 1:
+        raise ValueError("`parallel_dirs` and `parallel_files` can't be used together.")
 
     parsed = []
     if parallel_dirs > 1:
@@ -590,7 +718,14 @@ def parse_directory(  # noqa: C901
                 parsed.extend(res.get())
     else:
         for directory in directories:
-            parsed.extend(_parse_dir(directory, progress=progress, **parse_kwargs))
+            parsed.extend(
+                _parse_dir(
+                    directory,
+                    progress=progress,
+                    processes=int(parallel_files),
+                    **parse_kwargs,
+                )
+            )
 
     if not parsed:
         raise ValueError("No files found.")
@@ -608,16 +743,12 @@ def parse_directory(  # noqa: C901
 
     if read_file_groups:  # Read fields from file, but only one per group.
         for group_cols, parse_cols in read_from_file:
-            df = (
-                df.groupby(group_cols)
-                .apply(
-                    _parse_first_ds,
-                    cols=parse_cols,
-                    attrs_map=attrs_map,
-                    xr_open_kwargs=xr_open_kwargs,
-                )
-                .reset_index(drop=True)
-            )
+            groups = [
+                _parse_first_ds(grp, parse_cols, attrs_map, xr_open_kwargs)
+                for _, grp in df.groupby(group_cols, sort=False)
+            ]
+            # Same as groupby().apply(), entries with a missing group value are dropped.
+            df = pd.concat(groups, ignore_index=True) if groups else df.iloc[:0]
 
     # Everything below could be wrapped in a function to be applied to each row maybe allowing some basic parallelization with dask (or else).
     # Add homogeous info
@@ -626,20 +757,35 @@ def parse_directory(  # noqa: C901
 
     # Replace entries by definitions found in CV
     if cvs:
-        df = df.apply(_replace_in_row, axis=1, replacements=cvs)
+        df = _replace_in_df(df, cvs)
 
     # Fix potential legacy xrfreq
     if "xrfreq" in df.columns:
         df["xrfreq"] = df["xrfreq"].apply(ensure_new_xrfreq)
 
     # translate xrfreq into frequencies and vice-versa
+    # Each distinct value is translated only once, missing ones are left untouched.
     if {"xrfreq", "frequency"}.issubset(df.columns):
         df.fillna(
-            {"xrfreq": df["frequency"].apply(CV.frequency_to_xrfreq, default=pd.NA)},
+            {
+                "xrfreq": df["frequency"].map(
+                    {
+                        freq: CV.frequency_to_xrfreq(freq, default=pd.NA)
+                        for freq in df["frequency"].dropna().unique()
+                    }
+                )
+            },
             inplace=True,
         )
         df.fillna(
-            {"frequency": df["xrfreq"].apply(CV.xrfreq_to_frequency, default=pd.NA)},
+            {
+                "frequency": df["xrfreq"].map(
+                    {
+                        xrfreq: CV.xrfreq_to_frequency(xrfreq, default=pd.NA)
+                        for xrfreq in df["xrfreq"].dropna().unique()
+                    }
+                )
+            },
             inplace=True,
         )
 
@@ -649,15 +795,13 @@ def parse_directory(  # noqa: C901
     # `na_values=np.datetime64('')` is needed because pandas' NaT does not translate to numpy's NaT, but to float.
     if "date_start" in df.columns:
         df["date_start"] = (
-            df["date_start"]
-            .apply(date_parser)
+            _parse_dates(df["date_start"])
             .to_numpy(na_value=np.datetime64(""))
             .astype("<M8[ms]")
         )
     if "date_end" in df.columns:
         df["date_end"] = (
-            df["date_end"]
-            .apply(date_parser, end_of_period=True)
+            _parse_dates(df["date_end"], end_of_period=True)
             .to_numpy(na_value=np.datetime64(""))
             .astype("<M8[ms]")
         )
@@ -688,7 +832,7 @@ def parse_directory(  # noqa: C901
     # TODO: ensure variable is a tuple ?
 
     # ensure path is a string
-    df["path"] = df.path.apply(str)
+    df["path"] = df["path"].astype(str)
 
     # Sort columns and return
     if only_official_columns:
@@ -725,31 +869,46 @@ def parse_from_ds(  # noqa: C901
     xrkwargs:
         Arguments to be passed to open_dataset().
     """
-    get_time = bool(
-        {"frequency", "xrfreq", "date_start", "date_end"}.intersection(names)
-    )
+    time_names = {"frequency", "xrfreq", "date_start", "date_end"}
+    get_time = bool(time_names.intersection(names))
+    # The time fields fall back to the global attributes when the time coordinate
+    # is missing or too short, only "variable" never needs them.
+    get_attrs = bool(set(names) - {"variable"})
     if not isinstance(obj, xr.Dataset):
         obj = Path(obj)
 
     if isinstance(obj, Path) and obj.suffixes[-1] == ".zarr":
         logger.info(f"Parsing attributes from Zarr {obj}.")
         ds_attrs, variables, time = _parse_from_zarr(
-            obj, get_vars="variable" in names, get_time=get_time
+            obj,
+            get_vars="variable" in names,
+            get_time=get_time,
+            get_attrs=get_attrs,
         )
     elif isinstance(obj, Path) and obj.suffixes[-1] == ".nc":
         logger.info(f"Parsing attributes with netCDF4 from {obj}.")
         ds_attrs, variables, time = _parse_from_nc(
-            obj, get_vars="variable" in names, get_time=get_time
+            obj,
+            get_vars="variable" in names,
+            get_time=get_time,
+            get_attrs=get_attrs,
+            # The frequency needs the whole coordinate, the dates only need its ends.
+            time_bounds_only=not {"frequency", "xrfreq"}.intersection(names),
         )
     else:
-        if isinstance(obj, Path):
+        opened = isinstance(obj, Path)
+        if opened:
             logger.info(f"Parsing attributes with xarray from {obj}.")
+            if not get_time:  # Decoding an unused time coordinate can be costly
+                xrkwargs.setdefault("decode_times", False)
             obj = xr.open_dataset(obj, engine=get_engine(obj), **xrkwargs)
         ds_attrs = obj.attrs
         time = obj.indexes["time"] if "time" in obj else None
         variables = set(obj.data_vars.keys()).difference(
             [v for v in obj.data_vars if len(obj[v].dims) == 0]
         )
+        if opened:
+            obj.close()
 
     rev_attrs_map = {v: k for k, v in (attrs_map or {}).items()}
     attrs = {}
@@ -785,7 +944,10 @@ def parse_from_ds(  # noqa: C901
 
 
 def _parse_from_zarr(
-    path: Union[os.PathLike, str], get_vars: bool = True, get_time: bool = True
+    path: Union[os.PathLike, str],
+    get_vars: bool = True,
+    get_time: bool = True,
+    get_attrs: bool = True,
 ):
     """Obtain the list of variables, the time coordinate and the list of global attributes from a zarr dataset.
 
@@ -804,36 +966,38 @@ def _parse_from_zarr(
         If True, return the list of variables.
     get_time: bool
         If True, return the time coordinate.
+    get_attrs: bool
+        If True, return the global attributes. If False, an empty dictionary is returned.
     """
     path = Path(path)
 
-    if (path / ".zattrs").is_file():
+    ds_attrs = {}
+    if get_attrs and (path / ".zattrs").is_file():
         with (path / ".zattrs").open() as f:
             ds_attrs = json.load(f)
-    else:
-        ds_attrs = {}
 
     variables = []
     if get_vars:
         coords = []
-        for varpath in path.iterdir():
-            if varpath.is_dir() and (varpath / ".zattrs").is_file():
-                with (varpath / ".zattrs").open() as f:
-                    var_attrs = json.load(f)
-                if (
-                    varpath.name in var_attrs["_ARRAY_DIMENSIONS"]
-                    or len(var_attrs["_ARRAY_DIMENSIONS"]) == 0
-                ):
-                    coords.append(varpath.name)
-                if "coordinates" in var_attrs:
-                    coords.extend(
-                        list(map(str.strip, var_attrs["coordinates"].split(" ")))
-                    )
-        variables = [
-            varpath.name
-            for varpath in path.iterdir()
-            if varpath.name not in coords and varpath.is_dir()
-        ]
+        with os.scandir(path) as it:
+            for entry in it:
+                if not entry.is_dir():
+                    continue
+                variables.append(entry.name)
+                zattrs = os.path.join(entry.path, ".zattrs")
+                if os.path.isfile(zattrs):
+                    with open(zattrs) as f:
+                        var_attrs = json.load(f)
+                    if (
+                        entry.name in var_attrs["_ARRAY_DIMENSIONS"]
+                        or len(var_attrs["_ARRAY_DIMENSIONS"]) == 0
+                    ):
+                        coords.append(entry.name)
+                    if "coordinates" in var_attrs:
+                        coords.extend(
+                            list(map(str.strip, var_attrs["coordinates"].split(" ")))
+                        )
+        variables = [var for var in variables if var not in coords]
     time = None
     if get_time and (path / "time").is_dir():
         ds = zarr.open(path)
@@ -848,7 +1012,11 @@ def _parse_from_zarr(
 
 
 def _parse_from_nc(
-    path: Union[os.PathLike, str], get_vars: bool = True, get_time: bool = True
+    path: Union[os.PathLike, str],
+    get_vars: bool = True,
+    get_time: bool = True,
+    get_attrs: bool = True,
+    time_bounds_only: bool = False,
 ):
     """Obtain the list of variables, the time coordinate, and the list of global attributes from a netCDF dataset, using netCDF4.
 
@@ -860,9 +1028,13 @@ def _parse_from_nc(
         If True, return the list of variables.
     get_time: bool
         If True, return the time coordinate.
+    get_attrs: bool
+        If True, return the global attributes. If False, an empty dictionary is returned.
+    time_bounds_only: bool
+        If True, only the first and last elements of the time coordinate are decoded and returned.
     """
     ds = netCDF4.Dataset(str(Path(path)))
-    ds_attrs = {k: ds.getncattr(k) for k in ds.ncattrs()}
+    ds_attrs = {k: ds.getncattr(k) for k in ds.ncattrs()} if get_attrs else {}
 
     variables = []
     if get_vars:
@@ -878,10 +1050,13 @@ def _parse_from_nc(
 
     time = None
     if get_time and "time" in ds.variables:
+        nctime = ds["time"]
+        if time_bounds_only:
+            values = np.ma.concatenate([nctime[:1], nctime[-1:]])
+        else:
+            values = nctime[:]
         time = xr.CFTimeIndex(
-            cftime.num2date(
-                ds["time"][:], calendar=ds["time"].calendar, units=ds["time"].units
-            ).data
+            cftime.num2date(values, calendar=nctime.calendar, units=nctime.units).data
         )
     ds.close()
     return ds_attrs, variables, time
@@ -931,6 +1106,12 @@ def _schema_level(schema: Union[dict, list[str], str], facets: dict):
     raise ValueError(f"Invalid schema : {schema}")
 
 
+@lru_cache
+def _xrfreq_to_timedelta(xrfreq: str) -> pd.Timedelta:
+    # The CV is matched with regexes and a catalog only has a few frequencies.
+    return pd.Timedelta(CV.xrfreq_to_timedelta(xrfreq))
+
+
 def _schema_dates(facets: dict, optional: bool = False):
     if facets.get("xrfreq") == "fx":
         return "fx"
@@ -944,24 +1125,19 @@ def _schema_dates(facets: dict, optional: bool = False):
 
     start = date_parser(facets["date_start"])
     end = date_parser(facets["date_end"])
-    freq = pd.Timedelta(CV.xrfreq_to_timedelta(facets["xrfreq"]))
+    freq = _xrfreq_to_timedelta(facets["xrfreq"])
 
     # Full years : Starts on Jan 1st and is either annual or ends on Dec 31st (accepting Dec 30 for 360 cals)
     if (
         start.month == 1
         and start.day == 1
-        and (
-            freq >= pd.Timedelta(CV.xrfreq_to_timedelta("YS"))
-            or (end.month == 12 and end.day > 29)
-        )
+        and (freq >= _xrfreq_to_timedelta("YS") or (end.month == 12 and end.day > 29))
     ):
         if start.year == end.year:
             return f"{start:%4Y}"
         return f"{start:%4Y}-{end:%4Y}"
     # Full months : Starts on the 1st and is either monthly or ends on the last day
-    if start.day == 1 and (
-        freq >= pd.Timedelta(CV.xrfreq_to_timedelta("M")) or end.day > 27
-    ):
+    if start.day == 1 and (freq >= _xrfreq_to_timedelta("M") or end.day > 27):
         # Full months
         if (start.year, start.month) == (end.year, end.month):
             return f"{start:%4Y%m}"
@@ -1043,7 +1219,7 @@ def _build_path(
             | data.attrs
             | get_cat_attrs(data)
         )
-    elif isinstance(data, pd.Series):
+    elif isinstance(data, (dict, pd.Series)):
         facets = dict(data)
     else:
         raise NotImplementedError(f"Can't buld path with object of type {type(data)}")
@@ -1147,17 +1323,15 @@ def build_path(
 
         df = df.copy()
 
-        paths = df.apply(
-            _build_path,
-            axis=1,
-            result_type="expand",
-            schemas=schemas,
-            root=root,
-            get_type=True,
-            **extra_facets,
-        )
-        df["new_path"] = paths[0].apply(str)
+        # Iterating over records is much faster than building a Series for each row
+        paths = [
+            _build_path(
+                facets, schemas=schemas, root=root, get_type=True, **extra_facets
+            )
+            for facets in df.to_dict(orient="records")
+        ]
+        df["new_path"] = [str(path) for path, _ in paths]
         if len(schemas) > 1:
-            df["new_path_type"] = paths[1]
+            df["new_path_type"] = [path_type for _, path_type in paths]
         return df
     return _build_path(data, schemas=schemas, root=root, get_type=False, **extra_facets)
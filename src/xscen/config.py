@@ -50,7 +50,7 @@ import logging.config
 import types
 import warnings
 from copy import deepcopy
-from functools import wraps
+from functools import lru_cache, wraps
 from pathlib import Path
 from typing import Any
 
@@ -60,6 +60,8 @@ import yaml
 
 logger = logging.getLogger(__name__)
 EXTERNAL_MODULES = ["logging", "xarray", "xclim", "warnings"]
+# The libyaml-based loader is much faster, but it is not available in all installations of PyYAML.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 __all__ = [
     "CONFIG",
@@ -107,15 +109,17 @@ def recursive_update(d, other):
 
     Values that are Mappings are updated recursively as well.
     """
-    for k, v in other.items():
-        if isinstance(v, collections.abc.Mapping):
-            old_v = d.get(k)
-            if isinstance(old_v, collections.abc.Mapping):
-                d[k] = recursive_update(old_v, v)
-            else:
-                d[k] = v
-        else:
-            d[k] = v
+    # Walk the nested mappings with an explicit stack instead of recursive calls.
+    stack = [(d, other)]
+    while stack:
+        dst, src = stack.pop()
+        for k, v in src.items():
+            if isinstance(v, collections.abc.Mapping):
+                old_v = dst.get(k)
+                if isinstance(old_v, collections.abc.Mapping):
+                    stack.append((old_v, v))
+                    continue
+            dst[k] = v
     return d
 
 
@@ -130,6 +134,13 @@ def args_as_str(*args: tuple[Any, ...]) -> tuple[str, ...]:
     return tuple(new_args)
 
 
+@lru_cache(maxsize=64)
+def _read_config_file(path: str, mtime: int, size: int, encoding: str = None) -> dict:
+    # The modification time and size are only part of the cache key, so that edited files are read again.
+    with open(path, encoding=encoding) as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+
 def load_config(
     *elements, reset: bool = False, encoding: str = None, verbose: bool = False
 ):
@@ -188,17 +199,26 @@ def load_config(
                 configfiles = [file]
 
             for configfile in configfiles:
-                with configfile.open(encoding=encoding) as f:
-                    recursive_update(CONFIG, yaml.safe_load(f))
-                    if verbose:
-                        logger.info(f"Updated the config with {configfile}.")
+                stat = configfile.stat()
+                content = _read_config_file(
+                    str(configfile.resolve()), stat.st_mtime_ns, stat.st_size, encoding
+                )
+                # The cached content must not be modified by later changes to CONFIG
+                recursive_update(CONFIG, deepcopy(content))
+                if verbose:
+                    logger.info(f"Updated the config with {configfile}.")
 
     for module, old in zip(EXTERNAL_MODULES, old_external):
         if old != CONFIG.get(module, {}):
             _setup_external(module, CONFIG.get(module, {}))
 
 
+# Read-only default for missing config sections, so that no new dictionary is created on each call.
+_EMPTY = types.MappingProxyType({})
+
+
 def parse_config(func_or_cls):  # noqa: D103
+    # Get dotted module name, excluding the main package name.
     module = ".".join(func_or_cls.__module__.split(".")[1:])
 
     if isinstance(func_or_cls, type):
@@ -206,19 +226,21 @@ def parse_config(func_or_cls):  # noqa: D103
     else:
         func = func_or_cls
 
+    # The signature doesn't change, inspect it only once.
+    name = func.__name__
+    params = frozenset(inspect.signature(func).parameters)
+
     @wraps(func)
     def _wrapper(*args, **kwargs):
-        # Get dotted module name, excluding the main package name.
-
-        from_config = CONFIG.get(module, {}).get(func.__name__, {})
-        sig = inspect.signature(func)
-        if CONFIG.get("print_it_all"):
+        from_config = CONFIG.get(module, _EMPTY).get(name, _EMPTY)
+        verbose = CONFIG.get("print_it_all")
+        if verbose:
             logger.debug(f"For func {func}, found config {from_config}.")
             logger.debug(f"Original kwargs : {kwargs}")
         for k, v in from_config.items():
-            if k in sig.parameters:
+            if k in params:
                 kwargs.setdefault(k, v)
-        if CONFIG.get("print_it_all"):
+        if verbose:
             logger.debug(f"Modified kwargs : {kwargs}")
 
         return func(*args, **kwargs)
@@ -239,12 +261,14 @@ def _setup_external(module, config):
         xc.set_options(**config)
     elif module == "xarray":
         xr.set_options(**config)
-    elif module == "warning":
+    elif module == "warnings":
         for category, action in config.items():
             if category == "all":
                 warnings.simplefilter(action)
-            elif issubclass(getattr(builtins, category), builtins.Warning):
-                warnings.simplefilter(action, category=getattr(builtins, category))
+                continue
+            cat = getattr(builtins, category, None)
+            if isinstance(cat, type) and issubclass(cat, builtins.Warning):
+                warnings.simplefilter(action, category=cat)
 
 
 def get_configurable():
@@ -472,32 +472,26 @@ def measures_heatmap(
 
     hmap = []
     for meas in meas_datasets:
-        row = []
-        # iterate through all available properties
-        for var_name in meas:
-            da = meas[var_name]
-            # mean the absolute value of the bias over all positions and add to heat map
-            if "xclim.sdba.measures.RATIO" in da.attrs["history"]:
-                # if ratio, best is 1, this moves "best to 0 to compare with bias
-                row.append(abs(da - 1).mean().values)
-            else:
-                row.append(abs(da).mean().values)
-        # append all properties
-        hmap.append(row)
+        # if ratio, best is 1, this moves "best to 0 to compare with bias
+        meas = meas.assign(
+            {
+                var_name: meas[var_name] - 1
+                for var_name in meas
+                if "xclim.sdba.measures.RATIO" in meas[var_name].attrs["history"]
+            }
+        )
+        # mean the absolute value of the bias over all positions and add to heat map
+        # all properties are reduced (and computed) together
+        means = abs(meas).mean().compute()
+        hmap.append([means[var_name].values for var_name in meas])
 
     # plot heatmap of biases (1 column per properties, 1 row per dataset)
     hmap = np.array(hmap)
-    # normalize to 0-1 -> best-worst
-    hmap = np.array(
-        [
-            (
-                (c - np.min(c)) / (np.max(c) - np.min(c))
-                if np.max(c) != np.min(c)
-                else [0.5] * len(c)
-            )
-            for c in hmap.T
-        ]
-    ).T
+    # normalize to 0-1 -> best-worst, columns with a single value are set to 0.5
+    col_min = hmap.min(axis=0)
+    denom = hmap.max(axis=0) - col_min
+    with np.errstate(invalid="ignore", divide="ignore"):
+        hmap = np.where(denom == 0, 0.5, (hmap - col_min) / denom)
 
     name_of_datasets = name_of_datasets or list(range(1, hmap.shape[0] + 1))
     ds_hmap = xr.DataArray(
@@ -560,14 +554,10 @@ def measures_improvement(
             diff_bias = abs(ds1[var] - 1) - abs(ds2[var] - 1)
         else:
             diff_bias = abs(ds1[var]) - abs(ds2[var])
-        diff_bias = diff_bias.values.ravel()
-        diff_bias = diff_bias[~np.isnan(diff_bias)]
-
-        total = ds2[var].values.ravel()
-        total = total[~np.isnan(total)]
-
-        improved = diff_bias >= 0
-        percent_better.append(np.sum(improved) / len(total))
+        # NaNs are never counted as improved, no need to filter them out first.
+        improved = np.count_nonzero(diff_bias.values >= 0)
+        total = np.count_nonzero(~np.isnan(ds2[var].values))
+        percent_better.append(improved / total)
 
     ds_better = xr.DataArray(
         percent_better, coords={"properties": list(ds2.data_vars)}, dims="properties"
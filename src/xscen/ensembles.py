@@ -4,7 +4,8 @@ import inspect
 import logging
 import os
 import warnings
-from copy import deepcopy
+from collections import defaultdict
+from functools import lru_cache
 from itertools import chain, groupby
 from pathlib import Path
 from typing import Optional, Union
@@ -29,6 +30,12 @@ __all__ = [
 ]
 
 
+@lru_cache(maxsize=None)
+def _ensemble_accepts_weights(stat: str) -> bool:
+    """Whether the xclim ensemble statistic accepts a 'weights' argument."""
+    return "weights" in inspect.signature(getattr(ensembles, stat)).parameters
+
+
 @parse_config
 def ensemble_stats(  # noqa: C901
     datasets: Union[
@@ -104,7 +111,6 @@ def ensemble_stats(  # noqa: C901
     xclim.ensembles._robustness.robustness_coefficient,
     """
     create_kwargs = create_kwargs or {}
-    statistics = deepcopy(statistics)  # to avoid modifying the original dictionary
 
     # if input files are .zarr, change the engine automatically
     if isinstance(datasets, list) and isinstance(datasets[0], (str, os.PathLike)):
@@ -132,7 +138,8 @@ def ensemble_stats(  # noqa: C901
             )
 
     for stat in statistics_to_compute:
-        stats_kwargs = deepcopy(statistics.get(stat) or {})
+        # Shallow copies are enough to avoid modifying the original dictionary, as only top-level keys are changed.
+        stats_kwargs = dict(statistics.get(stat) or {})
         logger.info(
             f"Calculating {stat} from an ensemble of {len(ens.realization)} simulations."
         )
@@ -142,15 +149,17 @@ def ensemble_stats(  # noqa: C901
         if stat == "robustness_categories":
             real_stat = "robustness_categories"
             stat = "robustness_fractions"
-            categories_kwargs = deepcopy(stats_kwargs)
+            categories_kwargs = dict(stats_kwargs)
             categories_kwargs.pop("robustness_fractions", None)
-            stats_kwargs = deepcopy(
+            stats_kwargs = dict(
                 stats_kwargs.get("robustness_fractions", None)
                 or statistics.get("robustness_fractions", {})
             )
 
+        stat_func = getattr(ensembles, stat)
+
         if weights is not None:
-            if "weights" in inspect.getfullargspec(getattr(ensembles, stat))[0]:
+            if _ensemble_accepts_weights(stat):
                 stats_kwargs["weights"] = weights.reindex_like(ens.realization)
             else:
                 warnings.warn(
@@ -189,7 +198,7 @@ def ensemble_stats(  # noqa: C901
                         ens_v = ens[v]
 
                     # Call the function
-                    tmp = getattr(ensembles, stat)(ens_v, **stats_kwargs)
+                    tmp = stat_func(ens_v, **stats_kwargs)
 
                     # Manage the multiple outputs of change_significance
                     # FIXME: change_significance is deprecated and will be removed in xclim 0.49.
@@ -220,7 +229,7 @@ def ensemble_stats(  # noqa: C901
                         ens_stats = ens_stats.merge(tmp)
 
         else:
-            ens_stats = ens_stats.merge(getattr(ensembles, stat)(ens, **stats_kwargs))
+            ens_stats = ens_stats.merge(stat_func(ens, **stats_kwargs))
 
     # delete the realization coordinate if there
     if "realization" in ens_stats:
@@ -357,7 +366,7 @@ def generate_weights(  # noqa: C901
                 datasets[k] = datasets[k].isel({d: 0 for d in other_dims[k]})
 
     # Use metadata to identify the simulation attributes
-    keys = datasets.keys()
+    keys = list(datasets.keys())
     defdict = {
         "experiment": None,
         "institution": None,
@@ -435,9 +444,9 @@ def generate_weights(  # noqa: C901
             chain.from_iterable(
                 [
                     [
-                        datasets[list(keys)[d]][h]
+                        datasets[keys[d]][h]
                         for h in ["time", "horizon"]
-                        if h in datasets[list(keys)[d]].dims
+                        if h in datasets[keys[d]].dims
                     ]
                     for d in range(len(keys))
                 ]
@@ -473,18 +482,46 @@ def generate_weights(  # noqa: C901
             },
         )
 
+    # Independence structures
+    models_struct = (
+        ["source", "driving_model", "member-exp"]
+        if independence_level == "model"
+        else ["driving_model", "member-exp"]
+    )
+    if independence_level == "model":
+        realization_struct = (
+            ["source", "driving_model", "experiment"]
+            if balance_experiments
+            else ["source", "driving_model"]
+        )
+    else:
+        realization_struct = (
+            ["driving_model", "experiment"]
+            if balance_experiments
+            else ["driving_model"]
+        )
+    institution_struct = (
+        ["institution", "experiment"] if balance_experiments else ["institution"]
+    )
+
+    def _group_keys(struct):
+        # Group the simulations sharing the same values for the given attributes, keeping the order of info.
+        groups = defaultdict(list)
+        for k, v in info.items():
+            groups[tuple(v[s] for s in struct)].append(k)
+        return groups
+
+    models_groups = _group_keys(models_struct)
+    realization_groups = _group_keys(realization_struct)
+    institution_groups = (
+        _group_keys(institution_struct) if independence_level == "institution" else {}
+    )
+
     for i in range(len(info)):
-        sim = info[list(keys)[i]]
+        sim = info[keys[i]]
 
         # Number of models running a given realization of a driving model
-        models_struct = (
-            ["source", "driving_model", "member-exp"]
-            if independence_level == "model"
-            else ["driving_model", "member-exp"]
-        )
-        models = [
-            k for k in info.keys() if all([info[k][s] == sim[s] for s in models_struct])
-        ]
+        models = models_groups[tuple(sim[s] for s in models_struct)]
 
         if skipna:
             n_models = len(models)
@@ -494,37 +531,17 @@ def generate_weights(  # noqa: C901
             ).sum(dim="realization")
 
         # Number of realizations of a given driving model
-        if independence_level == "model":
-            realization_struct = (
-                ["source", "driving_model", "experiment"]
-                if balance_experiments
-                else ["source", "driving_model"]
-            )
-        else:
-            realization_struct = (
-                ["driving_model", "experiment"]
-                if balance_experiments
-                else ["driving_model"]
-            )
-        realizations = {
-            info[k]["member-exp"]
-            for k in info.keys()
-            if all([info[k][s] == sim[s] for s in realization_struct])
-        }
+        same_realization = realization_groups[tuple(sim[s] for s in realization_struct)]
+        realizations = {info[k]["member-exp"] for k in same_realization}
 
         if skipna:
             n_realizations = len(realizations)
         else:
-            n_realizations = xr.zeros_like(datasets[list(keys)[0]][v_for_skipna])
+            n_realizations = xr.zeros_like(datasets[keys[0]][v_for_skipna])
             r_models = dict()
             for r in realizations:
                 r_models[r] = [
-                    k
-                    for k in info.keys()
-                    if (
-                        all([info[k][s] == sim[s] for s in realization_struct])
-                        and (info[k]["member-exp"] == r)
-                    )
+                    k for k in same_realization if info[k]["member-exp"] == r
                 ]
                 n_realizations = n_realizations + (
                     xr.concat(
@@ -536,30 +553,19 @@ def generate_weights(  # noqa: C901
 
         # Number of driving models run by a given institution
         if independence_level == "institution":
-            institution_struct = (
-                ["institution", "experiment"]
-                if balance_experiments
-                else ["institution"]
-            )
-            institution = {
-                info[k]["driving_model"]
-                for k in info.keys()
-                if all([info[k][s] == sim[s] for s in institution_struct])
-            }
+            same_institution = institution_groups[
+                tuple(sim[s] for s in institution_struct)
+            ]
+            institution = {info[k]["driving_model"] for k in same_institution}
 
             if skipna:
                 n_institutions = len(institution)
             else:
-                n_institutions = xr.zeros_like(datasets[list(keys)[0]][v_for_skipna])
+                n_institutions = xr.zeros_like(datasets[keys[0]][v_for_skipna])
                 i_models = dict()
                 for ii in institution:
                     i_models[ii] = [
-                        k
-                        for k in info.keys()
-                        if (
-                            all([info[k][s] == sim[s] for s in institution_struct])
-                            and (info[k]["driving_model"] == ii)
-                        )
+                        k for k in same_institution if info[k]["driving_model"] == ii
                     ]
                     n_institutions = n_institutions + (
                         xr.concat(
@@ -1,7 +1,6 @@
 """Spatial tools."""
 
 import datetime
-import itertools
 import logging
 import warnings
 from collections.abc import Sequence
@@ -49,47 +48,57 @@ def creep_weights(mask: xr.DataArray, n: int = 1, mode: str = "clip") -> xr.Data
     DataArray
        Weights. The dot product must be taken over the last N dimensions.
     """
+    if mode not in ["clip", "wrap"]:
+        raise ValueError("mode must be either 'clip' or 'wrap'")
     da = mask
-    mask = da.values
-    neighbors = np.array(
-        list(itertools.product(*[np.arange(-n, n + 1) for j in range(mask.ndim)]))
-    ).T
-    src = []
-    dst = []
-    w = []
-    it = np.nditer(mask, flags=["f_index", "multi_index"], order="C")
-    for i in it:
-        if not i:
-            neigh_idx_2d = np.atleast_2d(it.multi_index).T + neighbors
-            neigh_idx_1d = np.ravel_multi_index(
-                neigh_idx_2d, mask.shape, order="C", mode=mode
-            )
-            if mode == "clip":
-                neigh_idx = np.unravel_index(
-                    np.unique(neigh_idx_1d), mask.shape, order="C"
-                )
-            elif mode == "wrap":
-                neigh_idx = np.unravel_index(neigh_idx_1d, mask.shape, order="C")
-            else:
-                raise ValueError("mode must be either 'clip' or 'wrap'")
-            neigh = mask[neigh_idx]
-            N = (neigh).sum()
-            if N > 0:
-                src.extend([it.multi_index] * N)
-                dst.extend(np.stack(neigh_idx)[:, neigh].T)
-                w.extend([1 / N] * N)
-            else:
-                src.extend([it.multi_index])
-                dst.extend([it.multi_index])
-                w.extend([np.nan])
-        else:
-            src.extend([it.multi_index])
-            dst.extend([it.multi_index])
-            w.extend([1])
-    crds = np.concatenate((np.array(src).T, np.array(dst).T), axis=0)
+    mask = da.values.astype(bool)
+    flat = mask.ravel()
+    # All offsets of the (2n+1)^ndim stencil, in the same order as itertools.product
+    neighbors = np.indices((2 * n + 1,) * mask.ndim).reshape(mask.ndim, -1) - n
+
+    # Neighbours of all False cells at once, one row per cell
+    false_cells = np.flatnonzero(~flat)
+    neigh_idx = (
+        np.stack(np.unravel_index(false_cells, mask.shape))[:, :, np.newaxis]
+        + neighbors[:, np.newaxis, :]
+    )
+    neigh_flat = np.ravel_multi_index(
+        tuple(neigh_idx.reshape(mask.ndim, -1)), mask.shape, order="C", mode=mode
+    ).reshape(false_cells.size, neighbors.shape[1])
+    # Sorted rows give the entries of each cell in the canonical order of sp.COO
+    neigh_flat = np.sort(neigh_flat, axis=1)
+    valid = flat[neigh_flat]
+    if mode == "clip":
+        # Clipped neighbours can be repeated, only count them once
+        valid[:, 1:] &= neigh_flat[:, 1:] != neigh_flat[:, :-1]
+    N = valid.sum(axis=1)
+
+    rows, cols = np.nonzero(valid)
+    orphans = false_cells[N == 0]
+    true_cells = np.flatnonzero(flat)
+    src = np.concatenate((false_cells[rows], orphans, true_cells))
+    dst = np.concatenate((neigh_flat[rows, cols], orphans, true_cells))
+    w = np.concatenate(
+        (1 / N[rows], np.full(orphans.size, np.nan), np.ones(true_cells.size))
+    )
+    # Merge the three groups, already sorted on their own, by source cell
+    order = np.argsort(src, kind="stable")
+    src, dst, w = src[order], dst[order], w[order]
+    crds = np.concatenate(
+        (np.unravel_index(src, mask.shape), np.unravel_index(dst, mask.shape)), axis=0
+    )
     return xr.DataArray(
-        sp.COO(crds, w, (*da.shape, *da.shape)),
-        dims=[f"{d}_out" for d in da.dims] + list(da.dims),
+        xr.Variable(
+            [f"{d}_out" for d in da.dims] + list(da.dims),
+            sp.COO(
+                crds,
+                w,
+                (*da.shape, *da.shape),
+                # Wrapped neighbours are repeated when the domain is smaller than the stencil
+                has_duplicates=mode == "wrap" and 2 * n + 1 > min(mask.shape),
+                sorted=True,
+            ),
+        ),
         coords=da.coords,
         name="creep_fill_weights",
     )
@@ -121,11 +130,30 @@ def creep_fill(da: xr.DataArray, w: xr.DataArray) -> xr.DataArray:
     def _dot(arr, wei):
         N = wei.ndim // 2
         extra_dim = arr.ndim - N
+        if isinstance(wei, sp.COO):
+            # Flatten the weights to a (out, in) CSR matrix, so that the product only goes through the non-zero weights
+            out_shape = wei.shape[:N]
+            wei = wei.reshape((int(np.prod(out_shape)), -1)).tocsr()
+            flat = arr.reshape((int(np.prod(arr.shape[:extra_dim])), -1))
+            return (wei @ flat.T).T.reshape(arr.shape[:extra_dim] + out_shape)
         return np.tensordot(arr, wei, axes=(np.arange(N) + extra_dim, np.arange(N) + N))
 
+    def _copy(arr, wei):
+        return arr.astype("float64")
+
+    def _is_identity(wei):
+        # Weights computed from a mask without False values only map each cell to itself
+        N = wei.ndim // 2
+        return (
+            isinstance(wei, sp.COO)
+            and wei.nnz == int(np.prod(wei.shape[N:]))
+            and np.array_equal(wei.coords[:N], wei.coords[N:])
+            and bool((wei.data == 1).all())
+        )
+
     N = w.ndim // 2
     return xr.apply_ufunc(
-        _dot,
+        _copy if _is_identity(w.data) else _dot,
         da,
         w,
         input_core_dims=[w.dims[N:], w.dims],
@@ -404,12 +432,16 @@ def _subset_sel(ds: xr.Dataset, *, name: Optional[str] = None, **kwargs) -> xr.D
 
 def _load_lon_lat(ds: xr.Dataset) -> xr.Dataset:
     """Load longitude and latitude for more efficient subsetting."""
-    if xc.core.utils.uses_dask(ds.cf["longitude"]):
-        logger.info("Loading longitude for more efficient subsetting.")
-        (ds[ds.cf["longitude"].name],) = dask.compute(ds[ds.cf["longitude"].name])
-    if xc.core.utils.uses_dask(ds.cf["latitude"]):
-        logger.info("Loading latitude for more efficient subsetting.")
-        (ds[ds.cf["latitude"].name],) = dask.compute(ds[ds.cf["latitude"].name])
+    to_load = []
+    for coord in ["longitude", "latitude"]:
+        if xc.core.utils.uses_dask(ds.cf[coord]):
+            logger.info(f"Loading {coord} for more efficient subsetting.")
+            to_load.append(ds.cf[coord].name)
+    if to_load:
+        # A single compute call, so that tasks shared by both coordinates run only once
+        loaded = dask.compute(*[ds[c].variable for c in to_load])
+        for c, var in zip(to_load, loaded):
+            ds[c] = var
 
     return ds
 
@@ -9,6 +9,7 @@ import re
 from collections import defaultdict
 from collections.abc import Sequence
 from datetime import datetime
+from functools import lru_cache
 from io import StringIO
 from itertools import chain
 from pathlib import Path
@@ -683,6 +684,12 @@ for cvfile in (Path(__file__).parent / "CVs").glob("*.json"):
         raise ValueError(f"While reading {cvfile} got {err}")
 
 
+@lru_cache(maxsize=256)
+def _units2pint(unit: str):
+    """Cached version of xclim's units2pint, for units given as strings."""
+    return units.units2pint(unit)
+
+
 def change_units(ds: xr.Dataset, variables_and_units: dict) -> xr.Dataset:
     """Change units of Datasets to non-CF units.
 
@@ -703,13 +710,14 @@ def change_units(ds: xr.Dataset, variables_and_units: dict) -> xr.Dataset:
     """
     with xr.set_options(keep_attrs=True):
         for v in variables_and_units:
-            if (v in ds) and (
-                units.units2pint(ds[v]) != units.units2pint(variables_and_units[v])
-            ):
-                time_in_ds = units.units2pint(ds[v]).dimensionality.get("[time]")
-                time_in_out = units.units2pint(
-                    variables_and_units[v]
-                ).dimensionality.get("[time]")
+            if v not in ds or ds[v].attrs["units"] == variables_and_units[v]:
+                # Nothing to do, skip parsing the units
+                continue
+            src_u = _units2pint(ds[v].attrs["units"])
+            dst_u = _units2pint(variables_and_units[v])
+            if src_u != dst_u:
+                time_in_ds = src_u.dimensionality.get("[time]")
+                time_in_out = dst_u.dimensionality.get("[time]")
 
                 if time_in_ds == time_in_out:
                     ds[v] = units.convert_units_to(ds[v], variables_and_units[v])
@@ -723,7 +731,7 @@ def change_units(ds: xr.Dataset, variables_and_units: dict) -> xr.Dataset:
                     raise NotImplementedError(
                         f"No known transformation between {ds[v].units} and {variables_and_units[v]} (temporal dimensionality mismatch)."
                     )
-            elif (v in ds) and (ds[v].units != variables_and_units[v]):
+            elif ds[v].units != variables_and_units[v]:
                 # update unit name if physical units are equal but not their name (ex. degC vs °C)
                 ds[v] = ds[v].assign_attrs(units=variables_and_units[v])
 
@@ -870,13 +878,24 @@ def clean_up(  # noqa: C901
         for var, n in round_var.items():
             ds[var] = ds[var].round(n)
 
-    def _search(a, b):
-        if a[-1] == "*":  # check if a is contained in b
-            return a[:-1] in b
-        elif a[0] == "^":
-            return b.startswith(a[1:])
-        else:
-            return a == b
+    def _matcher(list_of_attrs):
+        # Sort the rules once, so that each attribute is checked against all of them in a few calls
+        exact, prefixes, substrings = set(), [], []
+        for a in list_of_attrs:
+            if a[-1] == "*":  # check if a is contained in b
+                substrings.append(a[:-1])
+            elif a[0] == "^":
+                prefixes.append(a[1:])
+            else:
+                exact.add(a)
+        prefixes = tuple(prefixes)
+
+        def _search(b):
+            return (
+                b in exact or b.startswith(prefixes) or any(s in b for s in substrings)
+            )
+
+        return _search
 
     if common_attrs_only:
         from .catalog import generate_id
@@ -912,28 +931,22 @@ def clean_up(  # noqa: C901
     if to_level:
         ds.attrs["cat:processing_level"] = to_level
 
-    # remove attrs
-    if attrs_to_remove:
-        for var, list_of_attrs in attrs_to_remove.items():
-            obj = ds if var == "global" else ds[var]
-            for ds_attr in list(obj.attrs.keys()):  # iter over attrs in ds
-                for list_attr in list_of_attrs:  # check if we want to remove attrs
-                    if _search(list_attr, ds_attr):
-                        del obj.attrs[ds_attr]
-
-    # delete all attrs, but the ones in the list
-    if remove_all_attrs_except:
-        for var, list_of_attrs in remove_all_attrs_except.items():
-            obj = ds if var == "global" else ds[var]
-            for ds_attr in list(obj.attrs.keys()):  # iter over attrs in ds
-                delete = True  # assume we should delete it
-                for list_attr in list_of_attrs:
-                    if _search(list_attr, ds_attr):
-                        delete = (
-                            False  # if attr is on the list to not delete, don't delete
-                        )
-                if delete:
-                    del obj.attrs[ds_attr]
+    # remove attrs, then delete all attrs but the ones in the list, in a single pass over each object
+    attrs_to_remove = attrs_to_remove or {}
+    remove_all_attrs_except = remove_all_attrs_except or {}
+    for var in dict.fromkeys([*attrs_to_remove, *remove_all_attrs_except]):
+        obj = ds if var == "global" else ds[var]
+        to_remove = _matcher(attrs_to_remove[var]) if var in attrs_to_remove else None
+        to_keep = (
+            _matcher(remove_all_attrs_except[var])
+            if var in remove_all_attrs_except
+            else None
+        )
+        obj.attrs = {
+            k: v
+            for k, v in obj.attrs.items()
+            if not (to_remove and to_remove(k)) and (to_keep is None or to_keep(k))
+        }
 
     if add_attrs:
         for var, attrs in add_attrs.items():
@@ -942,10 +955,17 @@ def clean_up(  # noqa: C901
                 obj.attrs[attrname] = attrtmpl
 
     if change_attr_prefix:
-        for ds_attr in list(ds.attrs.keys()):
-            new_name = ds_attr.replace("cat:", change_attr_prefix)
-            if new_name:
-                ds.attrs[new_name] = ds.attrs.pop(ds_attr)
+        new_attrs = {}
+        for ds_attr, value in ds.attrs.items():
+            if "cat:" in ds_attr:
+                new_name = ds_attr.replace("cat:", change_attr_prefix) or ds_attr
+            elif ds_attr in new_attrs:
+                # An attribute renamed to the same name takes precedence
+                continue
+            else:
+                new_name = ds_attr
+            new_attrs[new_name] = value
+        ds.attrs = new_attrs
 
     return ds
 
@@ -1098,7 +1118,8 @@ def unstack_dates(
             seaname = "annual"
         else:
             seaname = f"annual-{anchor}"
-        dso = ds.expand_dims({new_dim: [seaname]})
+        # Assigned separately so that the label is stored as a fixed-width string, like the other frequencies
+        dso = ds.expand_dims(new_dim).assign_coords({new_dim: [seaname]})
         dso["time"] = xr.date_range(
             f"{first.year}-01-01",
             f"{last.year}-01-01",
@@ -153,6 +153,26 @@ def test_parse_directory_readgroups():
     assert (df[~t2m].variable.apply(len) == 0).all()
 
 
+@pytest.mark.requires_netcdf
+def test_parse_directory_parallel_files():
+    kwargs = dict(
+        directories=[str(SAMPLES_DIR)],
+        patterns=[
+            "{activity}/{domain}/{institution}/{source}/{experiment}/{member}/{frequency}/{?:_}.nc"
+        ],
+        read_from_file=["variable", "date_start", "date_end"],
+    )
+    df = cu.parse_directory(parallel_files=2, **kwargs)
+    exp = cu.parse_directory(**kwargs)
+    pd.testing.assert_frame_equal(
+        df.sort_values("path", ignore_index=True),
+        exp.sort_values("path", ignore_index=True),
+    )
+
+    with pytest.raises(ValueError, match="can't be used together"):
+        cu.parse_directory(parallel_files=2, parallel_dirs=2, **kwargs)
+
+
 @pytest.mark.requires_netcdf
 def test_parse_directory_offcols():
     with pytest.raises(
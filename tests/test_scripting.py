@@ -1,5 +1,4 @@
 import numpy as np
-from conftest import notebooks
 from xclim.testing.helpers import test_timeseries as timeseries
 
 import xscen as xs
@@ -8,7 +7,7 @@ from xscen import scripting as sc
 
 class TestScripting:
     ds = timeseries(
-        np.tile(np.arange(1, 2), 50),
+        np.tile(np.arange(1, 2), 5),
         variable="tas",
         start="2000-01-01",
         freq="AS-JAN",
@@ -26,8 +25,8 @@ class TestScripting:
         "cat:activity": "ScenarioMIP",
     }
 
-    def test_save_and_update(self):
-        root = str(notebooks / "_data")
+    def test_save_and_update(self, tmp_path):
+        root = str(tmp_path)
 
         cat = xs.ProjectCatalog.create(
             f"{root}/test_cat.json",
@@ -51,12 +50,12 @@ class TestScripting:
         assert (
             cat.df.path[1]
             == root
-            + "/simulation/raw/CMIP6/ScenarioMIP/global/CCCma/CanESM5/ssp585/r1i1p1f1/yr/tas/tas_yr_CMIP6_ScenarioMIP_global_CCCma_CanESM5_ssp585_r1i1p1f1_2000-2049.nc"  # noqa: E501
+            + "/simulation/raw/CMIP6/ScenarioMIP/global/CCCma/CanESM5/ssp585/r1i1p1f1/yr/tas/tas_yr_CMIP6_ScenarioMIP_global_CCCma_CanESM5_ssp585_r1i1p1f1_2000-2004.nc"  # noqa: E501
         )
         assert cat.df.source[1] == "CanESM5"
 
-    def test_move_and_delete(self):
-        root = str(notebooks / "_data")
+    def test_move_and_delete(self, tmp_path):
+        root = str(tmp_path)
 
         cat = xs.ProjectCatalog.create(
             f"{root}/test_cat.json",
@@ -143,6 +143,19 @@ class TestCreepFill:
         np.testing.assert_equal(out.isel(lat=0, lon=0), np.tile(np.nan, 3))
         np.testing.assert_equal(out.isel(lat=3, lon=3), np.tile(np.nan, 3))
 
+    def test_coords(self):
+        w = xs.spatial.creep_weights(self.ds["mask"], n=1)
+        assert set(w.coords) == set(self.ds["mask"].coords)
+
+    def test_identity(self):
+        da = self.ds["tas"].astype("float32").transpose("lon", "lat", "time")
+        w = xs.spatial.creep_weights(da.isel(time=0) > 0, n=1)
+        out = xs.spatial.creep_fill(da, w)
+        assert out.dtype == "float64"
+        assert out.dims == ("time", "lon", "lat")
+        assert out.attrs == {}
+        np.testing.assert_array_equal(out.transpose(*da.dims), da)
+
 
 class TestSubset:
     ds = datablock_3d(